@@ -1,16 +1,36 @@
 import os
-from dotenv import load_dotenv
+from dataclasses import dataclass
 
-load_dotenv()
+# Only parse a .env file when the environment is not already configured;
+# production sets real env vars, so the dotenv file work is skipped there
+if os.getenv('MYSQL_HOST') is None:
+    from dotenv import load_dotenv
+    load_dotenv()
 
+@dataclass(frozen=True)
 class Config:
     # Database configuration
-    MYSQL_HOST = os.getenv('MYSQL_HOST', 'localhost')
-    MYSQL_USER = os.getenv('MYSQL_USER', 'root')
-    MYSQL_PASSWORD = os.getenv('MYSQL_PASSWORD', '')
-    MYSQL_DATABASE = os.getenv('MYSQL_DATABASE', 'your_database_name')
-    MYSQL_PORT = int(os.getenv('MYSQL_PORT', 3306))
-    
+    MYSQL_HOST: str
+    MYSQL_USER: str
+    MYSQL_PASSWORD: str
+    MYSQL_DATABASE: str
+    MYSQL_PORT: int
+    MYSQL_POOL_SIZE: int
+
     # Flask configuration
-    SECRET_KEY = os.getenv('SECRET_KEY', 'your-secret-key-here')
-    DEBUG = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
+    SECRET_KEY: str
+    DEBUG: bool
+
+# Single shared instance, resolved from the environment once at import
+CONFIG = Config(
+    MYSQL_HOST=os.getenv('MYSQL_HOST', 'localhost'),
+    MYSQL_USER=os.getenv('MYSQL_USER', 'root'),
+    MYSQL_PASSWORD=os.getenv('MYSQL_PASSWORD', ''),
+    MYSQL_DATABASE=os.getenv('MYSQL_DATABASE', 'your_database_name'),
+    MYSQL_PORT=int(os.getenv('MYSQL_PORT', 3306)),
+    # (CPU count * 2) + 1 suits a threaded server talking to an SSD-backed
+    # DB; mysql-connector caps pool_size at 32
+    MYSQL_POOL_SIZE=int(os.getenv('MYSQL_POOL_SIZE', min((os.cpu_count() or 4) * 2 + 1, 32))),
+    SECRET_KEY=os.getenv('SECRET_KEY', 'your-secret-key-here'),
+    DEBUG=os.getenv('FLASK_DEBUG', 'True').lower() == 'true',
+)
@@ -1,6 +1,7 @@
 import mysql.connector
 from mysql.connector import Error, pooling
-from config import Config
+from config import CONFIG
+import json
 import logging
 import threading
 import time
@@ -8,19 +9,126 @@ import time
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# How long cached read results stay valid before the query is re-issued
+CACHE_TTL_SECONDS = 30
+
+# Query strings are built once at import time rather than per call.
+# Filter out records with empty or NULL values; the derived table in
+# _SQL_CUSTOMERS carries the distinct contract count along with each row.
+_SQL_CUSTOMERS = """
+    SELECT
+        c.serial,
+        c.contract,
+        c.customer,
+        c.power,
+        d.distinct_contracts
+    FROM Customers c
+    CROSS JOIN (
+        SELECT COUNT(DISTINCT contract) AS distinct_contracts
+        FROM Customers
+        WHERE contract > ''
+    ) d
+    WHERE c.is_valid = 1
+    ORDER BY c.customer, c.serial
+"""
+
+_SQL_CUSTOMER_COUNT = """
+    SELECT COUNT(*) FROM Customers
+    WHERE is_valid = 1
+"""
+
+_SQL_UNIQUE_CUSTOMER_COUNT = """
+    SELECT COUNT(DISTINCT customer) FROM Customers
+    WHERE is_valid = 1
+"""
+
+_SQL_UNIQUE_CUSTOMERS = """
+    SELECT DISTINCT customer FROM Customers
+    WHERE is_valid = 1
+    ORDER BY customer
+"""
+
+_SQL_CONTRACTS_BY_CUSTOMER = """
+    SELECT
+        serial,
+        contract,
+        customer,
+        power
+    FROM Customers
+    WHERE customer = %s
+    AND is_valid = 1
+    ORDER BY contract, serial
+"""
+
+# power is stored as VARCHAR, so coerce it to a number in SQL: the JSON
+# payload then carries real floats and Python skips per-row float() calls.
+# power + 0E0 yields a DOUBLE on every supported MySQL version, unlike
+# CAST(... AS DOUBLE) which needs 8.0.17+
+_SQL_CUSTOMERS_WITH_CONTRACTS = """
+    SELECT
+        customer,
+        contract,
+        JSON_ARRAYAGG(JSON_OBJECT(
+            'serial', serial,
+            'power', COALESCE(power + 0E0, 0E0)
+        )) AS transformers,
+        COUNT(*) AS transformer_count,
+        SUM(COALESCE(power + 0E0, 0E0)) AS total_power
+    FROM Customers
+    WHERE is_valid = 1
+    GROUP BY customer, contract
+    ORDER BY customer, contract
+"""
+
+# Delete invalid rows in bounded batches so the cleanup never holds row
+# locks (or undo log space) for the whole table at once
+CLEANUP_BATCH_SIZE = 10000
+
+_SQL_CLEANUP_DELETE = f"""
+    DELETE FROM Customers
+    WHERE is_valid = 0
+    LIMIT {CLEANUP_BATCH_SIZE}
+"""
+
+_SQL_UNIQUE_CONTRACT_IDS = """
+    SELECT DISTINCT contract
+    FROM Customers
+    WHERE contract > ''
+    ORDER BY contract
+"""
+
 class DatabaseManager:
     def __init__(self):
-        self.config = Config()
+        self.config = CONFIG
         self.connection_pool = None
         self._lock = threading.Lock()
+        self._cache = {}
         self._initialize_pool()
+
+    def _cache_get(self, key):
+        """Return a cached result if it has not expired yet, otherwise None"""
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and time.monotonic() < entry[1]:
+                return entry[0]
+        return None
+
+    def _cache_set(self, key, payload):
+        """Store a query result together with its expiry time"""
+        with self._lock:
+            self._cache[key] = (payload, time.monotonic() + CACHE_TTL_SECONDS)
+
+    def _invalidate_cache(self):
+        """Drop all cached query results (called after any write)"""
+        with self._lock:
+            self._cache.clear()
     
     def _initialize_pool(self):
         """Initialize connection pool"""
         try:
             self.connection_pool = mysql.connector.pooling.MySQLConnectionPool(
                 pool_name="iran_transfo_pool",
-                pool_size=5,
+                pool_size=self.config.MYSQL_POOL_SIZE,
                 pool_reset_session=True,
                 host=self.config.MYSQL_HOST,
                 user=self.config.MYSQL_USER,
@@ -28,24 +136,94 @@ class DatabaseManager:
                 database=self.config.MYSQL_DATABASE,
                 port=self.config.MYSQL_PORT,
                 autocommit=True,
-                connection_timeout=60,
+                connection_timeout=5,
                 use_unicode=True,
                 charset='utf8mb4'
             )
             logger.info("Database connection pool initialized successfully")
+            self._ensure_schema()
         except Error as e:
             logger.error(f"Error initializing connection pool: {e}")
             self.connection_pool = None
 
+    def _ensure_schema(self):
+        """Create the is_valid generated column and its covering index if
+        they are missing (MySQL has no IF NOT EXISTS for either, so the
+        information_schema catalog is checked first)"""
+        connection = None
+        cursor = None
+        try:
+            connection = self.get_connection()
+            if not connection:
+                return
+
+            # DDL needs a writable session
+            self._set_read_only(connection, False)
+            cursor = connection.cursor()
+
+            cursor.execute("""
+                SELECT COUNT(*) FROM information_schema.columns
+                WHERE table_schema = DATABASE()
+                AND table_name = 'Customers'
+                AND column_name = 'is_valid'
+            """)
+            if cursor.fetchone()[0] == 0:
+                # The expression is always 0 or 1 (never NULL): a NULL
+                # column fails its IS NOT NULL check first, so the AND
+                # chain short-circuits to FALSE
+                cursor.execute("""
+                    ALTER TABLE Customers
+                    ADD COLUMN is_valid TINYINT AS (
+                        customer IS NOT NULL AND customer != ''
+                        AND contract IS NOT NULL AND contract != ''
+                        AND serial IS NOT NULL AND serial != ''
+                    ) STORED,
+                    ADD INDEX idx_valid (is_valid, customer, contract, serial, power)
+                """)
+                logger.info("Added is_valid generated column and idx_valid index to Customers")
+
+            # idx_valid supersedes the old covering index: every read now
+            # filters on is_valid = 1 first, so drop the dead index
+            cursor.execute("""
+                SELECT COUNT(*) FROM information_schema.statistics
+                WHERE table_schema = DATABASE()
+                AND table_name = 'Customers'
+                AND index_name = 'idx_customers_ccsp'
+            """)
+            if cursor.fetchone()[0] > 0:
+                cursor.execute("DROP INDEX idx_customers_ccsp ON Customers")
+                logger.info("Dropped superseded index idx_customers_ccsp from Customers")
+        except Error as e:
+            logger.error(f"Error ensuring schema: {e}")
+        finally:
+            if cursor:
+                cursor.close()
+            if connection:
+                connection.close()
+
+    @staticmethod
+    def _set_read_only(connection, read_only):
+        """Toggle the session transaction access mode on a connection"""
+        cursor = connection.cursor()
+        cursor.execute(
+            "SET SESSION TRANSACTION READ ONLY" if read_only
+            else "SET SESSION TRANSACTION READ WRITE"
+        )
+        cursor.close()
+
     def get_connection(self):
         """Get a connection from the pool"""
         if not self.connection_pool:
             logger.error("Connection pool not initialized")
             return None
-        
+
         try:
             connection = self.connection_pool.get_connection()
             if connection.is_connected():
+                # The workload is read-heavy, so hand out connections in
+                # read-only mode and let InnoDB skip read-view setup;
+                # write paths flip the mode back explicitly
+                self._set_read_only(connection, True)
                 return connection
             else:
                 logger.error("Failed to get valid connection from pool")
@@ -77,42 +255,32 @@ class DatabaseManager:
             logger.error(f"Error closing connection pool: {e}")
     
     def get_customers(self):
-        """Fetch all customers from the database"""
+        """Fetch all customers plus the distinct contract count in one query
+
+        Returns a (customers, contract_count) tuple so callers do not need
+        a second round trip just to count the unique contract IDs.
+        """
         connection = None
         cursor = None
         try:
             connection = self.get_connection()
             if not connection:
-                return []
-            
+                return [], 0
+
             cursor = connection.cursor(dictionary=True)
-            
-            # Updated query to use the correct table name 'Customers'
-            # Filter out records with empty or NULL values
-            query = """
-                SELECT 
-                    serial,
-                    contract,
-                    customer,
-                    power
-                FROM Customers
-                WHERE customer IS NOT NULL 
-                AND customer != ''
-                AND contract IS NOT NULL 
-                AND contract != ''
-                AND serial IS NOT NULL 
-                AND serial != ''
-                ORDER BY customer, serial
-            """
-            
-            cursor.execute(query)
+
+            cursor.execute(_SQL_CUSTOMERS)
             customers = cursor.fetchall()
-            
-            return customers
-            
+
+            contract_count = 0
+            for row in customers:
+                contract_count = row.pop('distinct_contracts')
+
+            return customers, contract_count
+
         except Error as e:
             logger.error(f"Error fetching customers: {e}")
-            return []
+            return [], 0
         finally:
             if cursor:
                 cursor.close()
@@ -130,15 +298,7 @@ class DatabaseManager:
             
             cursor = connection.cursor()
             # Count only valid records (non-empty and non-NULL)
-            cursor.execute("""
-                SELECT COUNT(*) FROM Customers
-                WHERE customer IS NOT NULL 
-                AND customer != ''
-                AND contract IS NOT NULL 
-                AND contract != ''
-                AND serial IS NOT NULL 
-                AND serial != ''
-            """)
+            cursor.execute(_SQL_CUSTOMER_COUNT)
             count = cursor.fetchone()[0]
             
             return count
@@ -152,8 +312,42 @@ class DatabaseManager:
             if connection:
                 connection.close()
     
+    def get_unique_customer_count(self):
+        """Get the number of unique customers via a SQL aggregate, without
+        materializing the grouped customer data"""
+        cached = self._cache_get('unique_customer_count')
+        if cached is not None:
+            return cached
+
+        connection = None
+        cursor = None
+        try:
+            connection = self.get_connection()
+            if not connection:
+                return 0
+
+            cursor = connection.cursor()
+            cursor.execute(_SQL_UNIQUE_CUSTOMER_COUNT)
+            count = cursor.fetchone()[0]
+
+            self._cache_set('unique_customer_count', count)
+            return count
+
+        except Error as e:
+            logger.error(f"Error getting unique customer count: {e}")
+            return 0
+        finally:
+            if cursor:
+                cursor.close()
+            if connection:
+                connection.close()
+
     def get_unique_customers(self):
         """Get list of unique customer names"""
+        cached = self._cache_get('unique_customers')
+        if cached is not None:
+            return cached
+
         connection = None
         cursor = None
         try:
@@ -163,20 +357,12 @@ class DatabaseManager:
             
             cursor = connection.cursor()
             # Get only unique customers from valid records
-            cursor.execute("""
-                SELECT DISTINCT customer FROM Customers
-                WHERE customer IS NOT NULL 
-                AND customer != ''
-                AND contract IS NOT NULL 
-                AND contract != ''
-                AND serial IS NOT NULL 
-                AND serial != ''
-                ORDER BY customer
-            """)
+            cursor.execute(_SQL_UNIQUE_CUSTOMERS)
             customers = [row[0] for row in cursor.fetchall()]
-            
+
+            self._cache_set('unique_customers', customers)
             return customers
-            
+
         except Error as e:
             logger.error(f"Error getting unique customers: {e}")
             return []
@@ -196,27 +382,10 @@ class DatabaseManager:
                 return []
             
             cursor = connection.cursor(dictionary=True)
-            
-            query = """
-                SELECT 
-                    serial,
-                    contract,
-                    customer,
-                    power
-                FROM Customers
-                WHERE customer = %s
-                AND customer IS NOT NULL 
-                AND customer != ''
-                AND contract IS NOT NULL 
-                AND contract != ''
-                AND serial IS NOT NULL 
-                AND serial != ''
-                ORDER BY contract, serial
-            """
-            
-            cursor.execute(query, (customer_name,))
+
+            cursor.execute(_SQL_CONTRACTS_BY_CUSTOMER, (customer_name,))
             contracts = cursor.fetchall()
-            
+
             return contracts
             
         except Error as e:
@@ -230,6 +399,10 @@ class DatabaseManager:
 
     def get_customers_with_contracts(self):
         """Get customers with their contract lists grouped by unique contract numbers"""
+        cached = self._cache_get('customers_with_contracts')
+        if cached is not None:
+            return cached
+
         connection = None
         cursor = None
         try:
@@ -237,84 +410,56 @@ class DatabaseManager:
             if not connection:
                 return []
             
-            cursor = connection.cursor(dictionary=True)
-            
-            # Get all valid contracts grouped by customer
-            query = """
-                SELECT 
-                    customer,
-                    contract,
-                    serial,
-                    power
-                FROM Customers
-                WHERE customer IS NOT NULL 
-                AND customer != ''
-                AND contract IS NOT NULL 
-                AND contract != ''
-                AND serial IS NOT NULL 
-                AND serial != ''
-                ORDER BY customer, contract, serial
-            """
-            
-            cursor.execute(query)
-            contracts = cursor.fetchall()
-            
-            # Group contracts by customer and then by unique contract numbers
-            customers_dict = {}
-            for contract in contracts:
-                customer_name = contract['customer']
-                contract_number = contract['contract']
-                power = float(contract['power'] or 0)
-                
-                if customer_name not in customers_dict:
-                    customers_dict[customer_name] = {
-                        'customer': customer_name,
-                        'contracts': {},
-                        'unique_contracts': 0,
-                        'total_transformers': 0,
-                        'total_power': 0
-                    }
-                
-                # Group by unique contract numbers
-                if contract_number not in customers_dict[customer_name]['contracts']:
-                    customers_dict[customer_name]['contracts'][contract_number] = {
-                        'contract': contract_number,
-                        'transformers': [],
-                        'transformer_count': 0,
-                        'total_power': 0
-                    }
-                
-                # Add transformer (each power entry = 1 transformer)
-                transformer_info = {
-                    'serial': contract['serial'],
-                    'power': power
-                }
-                customers_dict[customer_name]['contracts'][contract_number]['transformers'].append(transformer_info)
-                customers_dict[customer_name]['contracts'][contract_number]['transformer_count'] += 1
-                customers_dict[customer_name]['contracts'][contract_number]['total_power'] += power
-                
-                # Update customer totals
-                customers_dict[customer_name]['total_transformers'] += 1
-                customers_dict[customer_name]['total_power'] += power
-            
-            # Convert to list format and calculate unique contracts
+            # Plain tuple cursor: cheaper rows than dictionary=True, and
+            # unbuffered so rows stream in fetchmany-sized batches
+            cursor = connection.cursor(buffered=False)
+            cursor.arraysize = 1000
+
+            # Aggregate per (customer, contract) inside MySQL so Python only
+            # has to fold the pre-sorted rows into the per-customer structure
+            cursor.execute(_SQL_CUSTOMERS_WITH_CONTRACTS)
+
+            # Rows arrive sorted by customer, so a single pass groups them.
+            # Locals instead of repeated dict/attribute lookups keep the
+            # per-group cost down on large result sets.
             customers_list = []
-            for customer_name, customer_data in customers_dict.items():
-                # Convert contracts dict to list
-                contracts_list = []
-                for contract_number, contract_data in customer_data['contracts'].items():
-                    contracts_list.append(contract_data)
-                    customer_data['unique_contracts'] += 1
-                
-                # Sort contracts by contract number
-                contracts_list.sort(key=lambda x: x['contract'])
-                
-                customer_data['contracts'] = contracts_list
-                customers_list.append(customer_data)
-            
-            # Sort customers by name
-            customers_list.sort(key=lambda x: x['customer'])
-            
+            current = None
+            current_customer = None
+            json_loads = json.loads
+            fetchmany = cursor.fetchmany
+            while True:
+                rows = fetchmany(1000)
+                if not rows:
+                    break
+                for customer, contract, transformers_json, transformer_count, total_power in rows:
+                    if customer != current_customer:
+                        current_customer = customer
+                        current = {
+                            'customer': customer,
+                            'contracts': [],
+                            'unique_contracts': 0,
+                            'total_transformers': 0,
+                            'total_power': 0
+                        }
+                        customers_list.append(current)
+
+                    # power is already numeric in the JSON thanks to the
+                    # CAST in SQL, so no per-row float() conversion needed
+                    transformers = json_loads(transformers_json)
+                    # JSON_ARRAYAGG does not guarantee ordering within a group
+                    transformers.sort(key=lambda t: t['serial'])
+
+                    current['contracts'].append({
+                        'contract': contract,
+                        'transformers': transformers,
+                        'transformer_count': transformer_count,
+                        'total_power': total_power
+                    })
+                    current['unique_contracts'] += 1
+                    current['total_transformers'] += transformer_count
+                    current['total_power'] += total_power
+
+            self._cache_set('customers_with_contracts', customers_list)
             return customers_list
             
         except Error as e:
@@ -336,34 +481,24 @@ class DatabaseManager:
                 return 0
             
             cursor = connection.cursor()
-            
-            # Count records to be deleted
-            cursor.execute("""
-                SELECT COUNT(*) FROM Customers
-                WHERE customer IS NULL 
-                OR customer = ''
-                OR contract IS NULL 
-                OR contract = ''
-                OR serial IS NULL 
-                OR serial = ''
-            """)
-            count_to_delete = cursor.fetchone()[0]
-            
-            if count_to_delete > 0:
-                # Delete empty records
-                cursor.execute("""
-                    DELETE FROM Customers
-                    WHERE customer IS NULL 
-                    OR customer = ''
-                    OR contract IS NULL 
-                    OR contract = ''
-                    OR serial IS NULL 
-                    OR serial = ''
-                """)
+
+            # Delete empty records batch by batch, using rowcount instead
+            # of a separate counting query (needs a writable session)
+            self._set_read_only(connection, False)
+            deleted_count = 0
+            while True:
+                cursor.execute(_SQL_CLEANUP_DELETE)
                 connection.commit()
-                logger.info(f"Cleaned up {count_to_delete} empty records from database")
-            
-            return count_to_delete
+                deleted_count += cursor.rowcount
+                if cursor.rowcount < CLEANUP_BATCH_SIZE:
+                    break
+            self._set_read_only(connection, True)
+
+            if deleted_count > 0:
+                self._invalidate_cache()
+                logger.info(f"Cleaned up {deleted_count} empty records from database")
+
+            return deleted_count
             
         except Error as e:
             logger.error(f"Error cleaning up empty records: {e}")
@@ -379,6 +514,10 @@ class DatabaseManager:
         Fetch unique contract IDs from the Customers table
         and return them as a list.
         """
+        cached = self._cache_get('unique_contract_ids')
+        if cached is not None:
+            return cached
+
         connection = None
         cursor = None
         try:
@@ -387,15 +526,9 @@ class DatabaseManager:
                 return []
 
             cursor = connection.cursor()
-            query = """
-                SELECT DISTINCT contract 
-                FROM Customers
-                WHERE contract IS NOT NULL
-                AND contract != ''
-                ORDER BY contract
-            """
-            cursor.execute(query)
+            cursor.execute(_SQL_UNIQUE_CONTRACT_IDS)
             contracts = [row[0] for row in cursor.fetchall()]
+            self._cache_set('unique_contract_ids', contracts)
             return contracts
 
         except Error as e:
@@ -1,13 +1,16 @@
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, render_template, jsonify, request, Response, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+from flask_compress import Compress
 from flask_cors import CORS
 from database import DatabaseManager
-from config import Config
+from config import CONFIG
+import hashlib
 import logging
+import orjson
 import signal
 import sys
 import atexit
 import threading
-import time
 
 # Configure logging
 logging.basicConfig(
@@ -20,11 +23,33 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson's C serializer, so jsonify and
+    request.get_json run several times faster than with stdlib json"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 # Initialize Flask app
 app = Flask(__name__)
-app.config.from_object(Config)
+app.config.from_object(CONFIG)
+app.json = OrjsonProvider(app)
 CORS(app)
 
+# Compress JSON responses (repeated field names compress ~10x); brotli
+# level 4 gives a good ratio without noticeable CPU cost. Streamed
+# responses pass through uncompressed: Flask-Compress would otherwise
+# buffer the whole stream in memory before compressing it, defeating the
+# per-customer memory bound of the streamed /api/customers endpoint.
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = 1024
+app.config['COMPRESS_BR_LEVEL'] = 4
+app.config['COMPRESS_STREAMS'] = False
+Compress(app)
+
 # Initialize database manager
 db_manager = DatabaseManager()
 
@@ -53,6 +78,41 @@ signal.signal(signal.SIGTERM, signal_handler)
 # Register cleanup function
 atexit.register(cleanup_resources)
 
+# ETag for the customers payload, keyed by the cached list object so it
+# is only recomputed when the DB manager's TTL cache refreshes
+_customers_etag_cache = (None, None)
+
+def _customers_etag(customers):
+    """Return a weak ETag for the customers payload, reusing the last
+    digest while the underlying cached list is unchanged"""
+    global _customers_etag_cache
+    cached_payload, cached_etag = _customers_etag_cache
+    if cached_payload is customers and cached_etag is not None:
+        return cached_etag
+    etag = hashlib.blake2b(
+        orjson.dumps(customers), digest_size=16
+    ).hexdigest()
+    _customers_etag_cache = (customers, etag)
+    return etag
+
+def _etag_matches(etag):
+    """True when the client's If-None-Match covers this ETag, tolerating
+    the ':algorithm' suffix Flask-Compress appends on compressed bodies"""
+    for candidate in request.if_none_match:
+        if candidate == etag or candidate.rsplit(':', 1)[0] == etag:
+            return True
+    return False
+
+def _with_caching_headers(response):
+    """Attach an ETag and short Cache-Control to a JSON response,
+    answering with 304 when the client already has the current body"""
+    etag = hashlib.blake2b(response.get_data(), digest_size=16).hexdigest()
+    if _etag_matches(etag):
+        response = Response(status=304)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, max-age=30'
+    return response
+
 @app.route('/')
 def index():
     """Serve the main HTML page"""
@@ -72,12 +132,28 @@ def get_customers():
         customers = db_manager.get_customers_with_contracts()
         if customers is None:
             customers = []
-        
-        return jsonify({
-            'success': True,
-            'customers': customers,
-            'count': len(customers)
-        })
+
+        etag = _customers_etag(customers)
+        if _etag_matches(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'private, max-age=30'
+            return response
+
+        # Stream one customer at a time instead of serializing the whole
+        # payload into a single string, keeping peak memory per-customer
+        def generate():
+            yield b'{"success": true, "customers": ['
+            for index, customer in enumerate(customers):
+                if index:
+                    yield b','
+                yield orjson.dumps(customer)
+            yield b'], "count": %d}' % len(customers)
+
+        response = Response(stream_with_context(generate()), mimetype='application/json')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, max-age=30'
+        return response
     except Exception as e:
         logger.error(f"Error in get_customers endpoint: {e}", exc_info=True)
         return jsonify({
@@ -97,16 +173,15 @@ def get_customers_contracts():
         }), 503
     
     try:
-        contracts = db_manager.get_customers()
-        contract = db_manager.get_unique_contract_ids()
+        contracts, contract_count = db_manager.get_customers()
         if contracts is None:
             contracts = []
-        
-        return jsonify({
+
+        return _with_caching_headers(jsonify({
             'success': True,
             'contracts': contracts,
-            'count': len(contract)
-        })
+            'count': contract_count
+        }))
     except Exception as e:
         logger.error(f"Error in get_customers_contracts endpoint: {e}", exc_info=True)
         return jsonify({
@@ -130,11 +205,11 @@ def get_unique_customers():
         if unique_customers is None:
             unique_customers = []
         
-        return jsonify({
+        return _with_caching_headers(jsonify({
             'success': True,
             'customers': unique_customers,
             'count': len(unique_customers)
-        })
+        }))
     except Exception as e:
         logger.error(f"Error in get_unique_customers endpoint: {e}", exc_info=True)
         return jsonify({
@@ -182,13 +257,12 @@ def get_customer_count():
         }), 503
     
     try:
-        customers = db_manager.get_customers_with_contracts()
-        count = len(customers) if customers else 0
-        
-        return jsonify({
+        count = db_manager.get_unique_customer_count()
+
+        return _with_caching_headers(jsonify({
             'success': True,
             'count': count
-        })
+        }))
     except Exception as e:
         logger.error(f"Error in get_customer_count endpoint: {e}", exc_info=True)
         return jsonify({
@@ -196,6 +270,56 @@ def get_customer_count():
             'error': 'Failed to get customer count'
         }), 500
 
+@app.route('/api/bootstrap')
+def bootstrap():
+    """API endpoint returning every dataset the frontend needs for the
+    initial page render, derived from a single database query"""
+    if shutdown_flag.is_set():
+        return jsonify({
+            'success': False,
+            'error': 'Server is shutting down'
+        }), 503
+
+    try:
+        customers = db_manager.get_customers_with_contracts()
+        if customers is None:
+            customers = []
+
+        # Derive the other payloads from the grouped data instead of
+        # issuing one query per endpoint; customers is already sorted
+        unique_customers = [customer['customer'] for customer in customers]
+        contracts = [
+            {
+                'serial': transformer['serial'],
+                'contract': contract['contract'],
+                'customer': customer['customer'],
+                'power': transformer['power']
+            }
+            for customer in customers
+            for contract in customer['contracts']
+            for transformer in contract['transformers']
+        ]
+        contract_count = len({
+            contract['contract']
+            for customer in customers
+            for contract in customer['contracts']
+        })
+
+        return _with_caching_headers(jsonify({
+            'success': True,
+            'customers': customers,
+            'unique_customers': unique_customers,
+            'count': len(customers),
+            'contracts': contracts,
+            'contract_count': contract_count
+        }))
+    except Exception as e:
+        logger.error(f"Error in bootstrap endpoint: {e}", exc_info=True)
+        return jsonify({
+            'success': False,
+            'error': 'Failed to fetch bootstrap data'
+        }), 500
+
 @app.route('/api/health')
 def health_check():
     """Health check endpoint"""
@@ -18,9 +18,7 @@ class CustomerApp {
         }
         this.bindEvents();
         this.checkDatabaseHealth();
-        this.loadUniqueCustomers();
-        this.loadCustomers();
-        this.loadContractCount();
+        this.loadBootstrapData();
         this.isInitialized = true;
     }
 
@@ -87,43 +85,29 @@ class CustomerApp {
         }
     }
 
-    async loadUniqueCustomers() {
-        try {
-            const response = await fetch('/api/customers/unique');
-            const data = await response.json();
-
-            if (data.success) {
-                this.uniqueCustomers = data.customers;
-                this.populateCustomerFilter();
-                this.updateCustomerCount(data.count);
-            } else {
-                console.error('Failed to load unique customers:', data.error);
-            }
-        } catch (error) {
-            console.error('Error loading unique customers:', error);
-        }
-    }
-
-    async loadCustomers() {
+    async loadBootstrapData() {
         this.showLoading();
         this.hideError();
         this.hideNoCustomers();
 
         try {
-            const response = await fetch('/api/customers');
+            const response = await fetch('/api/bootstrap');
             const data = await response.json();
 
             if (data.success) {
                 this.customers = data.customers;
                 this.filteredCustomers = [...this.customers];
+                this.uniqueCustomers = data.unique_customers;
+                this.populateCustomerFilter();
                 this.updateCustomerCount(data.count);
+                this.updateContractCount(data.contract_count);
                 this.renderCustomers();
                 this.hideLoading();
             } else {
                 throw new Error(data.error || 'Failed to load customers');
             }
         } catch (error) {
-            console.error('Error loading customers:', error);
+            console.error('Error loading bootstrap data:', error);
             this.showError('Failed to load customers. Please try again.');
             this.hideLoading();
         }
@@ -344,8 +328,7 @@ class CustomerApp {
     }
 
     refreshData() {
-        this.loadUniqueCustomers();
-        this.loadCustomers();
+        this.loadBootstrapData();
     }
 
     showLoading() {
@@ -397,21 +380,6 @@ class CustomerApp {
         this.isInitialized = false;
     }
 
-    async loadContractCount() {
-        try {
-            const response = await fetch('/api/customers/contracts');
-            const data = await response.json();
-    
-            if (data.success) {
-                this.updateContractCount(data.count);
-            } else {
-                console.error('Failed to load contract count:', data.error);
-            }
-        } catch (error) {
-            console.error('Error loading contract count:', error);
-        }
-    }
-
 }
 
 // Global app instance